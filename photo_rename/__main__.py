@@ -1,9 +1,9 @@
 import sys
 
-from PySide6.QtCore import QFile
 from PySide6.QtGui import QIcon
 from PySide6.QtWidgets import QApplication
 
+from photo_rename.cache import try_open_exif_cache
 from photo_rename.config import APP_DIR, APP_NAME, load_config
 from photo_rename.model import MainWindowModel
 from photo_rename.view import MainWindow
@@ -20,13 +20,16 @@ def main() -> None:
     icon = QIcon((APP_DIR / "resources" / "favicon.ico").as_posix())
     app.setWindowIcon(icon)
 
-    ui = QFile(APP_DIR / "resources" / "main_window.ui")
-
-    model = MainWindowModel(config)
+    exif_cache = try_open_exif_cache()
+    model = MainWindowModel(config, exif_cache)
     vm = MainWindowViewModel(model)
-    window = MainWindow(vm, ui)
+    window = MainWindow(vm)
     window.setWindowTitle(APP_NAME)
     window.show()
+    app.aboutToQuit.connect(model.flush_config)
+    app.aboutToQuit.connect(model.cancel_path_map)
+    if exif_cache is not None:
+        app.aboutToQuit.connect(exif_cache.close)
 
     sys.exit(app.exec())
 
@@ -0,0 +1,101 @@
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+
+from photo_rename.config import EXIF_CACHE_PATH
+from photo_rename.filing import DateProperty, DateType
+
+QUERY_CHUNK = 500
+
+
+class ExifCache:
+    """EXIF dates persisted in sqlite, keyed by (path, mtime_ns, size)"""
+
+    def __init__(self, fp: str | Path = EXIF_CACHE_PATH) -> None:
+        fp = Path(fp)
+        fp.parent.mkdir(parents=True, exist_ok=True)
+        self.__lock = threading.Lock()
+        self.__conn = sqlite3.connect(fp, check_same_thread=False)
+        self.__conn.execute("PRAGMA journal_mode=WAL")
+        self.__conn.execute("PRAGMA synchronous=NORMAL")
+        self.__conn.execute(
+            "CREATE TABLE IF NOT EXISTS exif ("
+            "path TEXT PRIMARY KEY, "
+            "mtime_ns INTEGER NOT NULL, "
+            "size INTEGER NOT NULL, "
+            "date_taken TEXT)"
+        )
+        self.__conn.commit()
+
+    def get_many(
+        self, entries: list[tuple[str, os.stat_result | None]]
+    ) -> list[DateProperty | None]:
+        """Look up cached EXIF results; None where missing, stale or broken"""
+        keys = [os.path.abspath(path) for path, _ in entries]
+        found = {}
+        with self.__lock:
+            for i in range(0, len(keys), QUERY_CHUNK):
+                chunk = keys[i : i + QUERY_CHUNK]
+                marks = ",".join("?" * len(chunk))
+                found.update(
+                    (row[0], row[1:])
+                    for row in self.__conn.execute(
+                        "SELECT path, mtime_ns, size, date_taken FROM exif "
+                        f"WHERE path IN ({marks})",
+                        chunk,
+                    )
+                )
+
+        results = []
+        for key, (_, st) in zip(keys, entries):
+            row = found.get(key)
+            if st is None or row is None:
+                results.append(None)
+            elif row[:2] != (st.st_mtime_ns, st.st_size):
+                results.append(None)
+            elif row[2] is None:
+                results.append(DateProperty(None, DateType.NO_DATA))
+            else:
+                results.append(_parse_date_taken(row[2]))
+        return results
+
+    def put_many(
+        self, entries: list[tuple[str, os.stat_result, DateProperty]]
+    ) -> None:
+        """Store freshly read EXIF results in a single transaction"""
+        rows = [
+            (
+                os.path.abspath(path),
+                st.st_mtime_ns,
+                st.st_size,
+                dproperty.dt.isoformat()
+                if dproperty.dtype == DateType.TAKEN
+                else None,
+            )
+            for path, st, dproperty in entries
+        ]
+        with self.__lock, self.__conn:
+            self.__conn.executemany(
+                "INSERT OR REPLACE INTO exif VALUES (?, ?, ?, ?)", rows
+            )
+
+    def close(self) -> None:
+        with self.__lock:
+            self.__conn.close()
+
+
+def _parse_date_taken(value: object) -> DateProperty | None:
+    """Turn a stored date into a TAKEN result; None for unusable rows"""
+    try:
+        return DateProperty(datetime.fromisoformat(value), DateType.TAKEN)
+    except (TypeError, ValueError):
+        return None
+
+
+def try_open_exif_cache(fp: str | Path = EXIF_CACHE_PATH) -> ExifCache | None:
+    try:
+        return ExifCache(fp)
+    except Exception:
+        return None
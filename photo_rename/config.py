@@ -10,6 +10,7 @@ from photo_rename.shared import NamingMethod
 APP_DIR = Path(__file__).resolve().parent.parent
 APP_NAME = "Photo Rename"
 CONFIG_PATH = Path(os.getenv("APPDATA"), APP_NAME, "config.json")
+EXIF_CACHE_PATH = Path(os.getenv("APPDATA"), APP_NAME, "exif_cache.sqlite")
 
 
 @dataclass
@@ -52,8 +53,10 @@ def save_config(config: Config, fp: str | Path = CONFIG_PATH) -> None:
         elif isinstance(value, Enum):
             str_config[key] = value.value
 
-    with fp.open("w") as f:
+    tmp_fp = fp.with_name(fp.name + ".tmp")
+    with tmp_fp.open("w") as f:
         json.dump(str_config, f, indent=4, ensure_ascii=False)
+    os.replace(tmp_fp, fp)
 
 
 def try_save_config(config: Config, fp: str | Path = CONFIG_PATH) -> None:
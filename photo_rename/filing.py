@@ -1,14 +1,33 @@
 import os.path
 import posixpath
+import stat
+import struct
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum, auto
+from functools import lru_cache
 from pathlib import Path
+from typing import BinaryIO
 
-from PIL import ExifTags, Image
+from PIL import ExifTags, Image, UnidentifiedImageError
 from pillow_heif import register_heif_opener
 
-register_heif_opener()
+_HEIF_REGISTERED = False
+
+
+def _register_heif_opener() -> None:
+    """Register the HEIF plugin with Pillow once per process"""
+    global _HEIF_REGISTERED
+    if _HEIF_REGISTERED:
+        return
+    register_heif_opener(thumbnails=False, depth_images=False)
+    _HEIF_REGISTERED = True
+
+
+_register_heif_opener()
+
+MAX_WORKERS = min(8, (os.cpu_count() or 1) * 2)
 
 
 class DateType(Enum):
@@ -19,7 +38,29 @@ class DateType(Enum):
     NO_DATA = auto()
 
 
-@dataclass
+class ImageKind(Enum):
+    JPEG = auto()
+    PNG = auto()
+    HEIF = auto()
+    BMP = auto()
+    GIF = auto()
+    UNKNOWN = auto()
+
+
+HEIF_BRANDS = {b"heic", b"heix", b"hevc", b"hevx", b"heim", b"heis", b"mif1"}
+PIL_FORMATS = {
+    ImageKind.JPEG: ["JPEG"],
+    ImageKind.PNG: ["PNG"],
+    ImageKind.HEIF: ["HEIF"],
+}
+EXIF_DATE_FORMATS = (
+    "%Y:%m:%d %H:%M:%S",
+    "%Y-%m-%d %H:%M:%S",
+    "%Y-%m-%dT%H:%M:%S",
+)
+
+
+@dataclass(slots=True)
 class DateProperty:
     dt: datetime | None
     dtype: DateType
@@ -50,38 +91,211 @@ def replace_path_filename(path: str, f_name: str) -> str:
     return posixpath.join(dir_name, f"{f_name}{ext}".format(name=name))
 
 
+def _parse_exif_datetime(value: str) -> datetime:
+    """Parse an EXIF date string, trying the standard shape first"""
+    value = str(value).strip("\x00 ")[:19]
+    # fromisoformat also takes partial values like "2020:01:02", so only use
+    # it on a complete "YYYY?MM?DD?HH:MM:SS" shape
+    if (
+        len(value) == 19
+        and value[4] == value[7]
+        and value[10] in " T"
+        and value[13] == value[16] == ":"
+    ):
+        try:
+            if value[4] == ":":
+                return datetime.fromisoformat(value.replace(":", "-", 2))
+            if value[4] == "-":
+                return datetime.fromisoformat(value)
+        except ValueError:
+            pass
+    for fmt in EXIF_DATE_FORMATS:
+        try:
+            return datetime.strptime(value, fmt)
+        except ValueError:
+            continue
+    raise ValueError(f"Unknown EXIF date format: {value!r}")
+
+
+def _parse_first_exif_datetime(values: list) -> datetime | None:
+    """Parse the first EXIF date value that is set and well formed"""
+    for value in values:
+        if not value:
+            continue
+        try:
+            return _parse_exif_datetime(value)
+        except ValueError:
+            continue
+    return None
+
+
+def _sniff_kind(header: bytes) -> ImageKind:
+    """Identify the image container from its leading magic bytes"""
+    if header.startswith(b"\xff\xd8"):
+        return ImageKind.JPEG
+    elif header.startswith(b"\x89PNG"):
+        return ImageKind.PNG
+    elif header[4:8] == b"ftyp" and header[8:12] in HEIF_BRANDS:
+        return ImageKind.HEIF
+    elif header.startswith(b"BM"):
+        return ImageKind.BMP
+    elif header.startswith(b"GIF8"):
+        return ImageKind.GIF
+    return ImageKind.UNKNOWN
+
+
+def _read_ifd_tags(
+    tiff: bytes, endian: str, offset: int, wanted: set[int]
+) -> dict[int, str | int]:
+    """Read the ASCII and LONG values of the wanted tags from one TIFF IFD"""
+    tags = {}
+    (count,) = struct.unpack_from(endian + "H", tiff, offset)
+    for i in range(count):
+        entry = offset + 2 + 12 * i
+        tag, type_, n, value = struct.unpack_from(endian + "HHII", tiff, entry)
+        if tag not in wanted:
+            continue
+        if type_ == 2:
+            start = value if n > 4 else entry + 8
+            raw = tiff[start : start + n]
+            tags[tag] = raw.rstrip(b"\x00").decode("ascii", "replace")
+        elif type_ == 4:
+            tags[tag] = value
+    return tags
+
+
+def _fast_jpeg_datetimes(fp: BinaryIO) -> list[str]:
+    """Read DateTimeOriginal and DateTime straight from the JPEG APP1 segment
+
+    Returns the values that are set, DateTimeOriginal first, and raises
+    ValueError or struct.error when the segment layout is not understood.
+    """
+    fp.seek(2)
+    while True:
+        header = fp.read(4)
+        if len(header) < 4 or header[0] != 0xFF:
+            raise ValueError("Unexpected JPEG segment header")
+        marker = header[1]
+        if marker in (0xDA, 0xD9):
+            return []
+
+        (length,) = struct.unpack(">H", header[2:])
+        if marker != 0xE1:
+            fp.seek(length - 2, os.SEEK_CUR)
+            continue
+        segment = fp.read(length - 2)
+        if segment.startswith(b"Exif\x00\x00"):
+            break
+
+    tiff = segment[6:]
+    if tiff[:2] == b"II":
+        endian = "<"
+    elif tiff[:2] == b"MM":
+        endian = ">"
+    else:
+        raise ValueError("Unknown TIFF byte order")
+
+    (ifd0_offset,) = struct.unpack_from(endian + "I", tiff, 4)
+    ifd0 = _read_ifd_tags(
+        tiff, endian, ifd0_offset, {ExifTags.Base.DateTime, ExifTags.IFD.Exif}
+    )
+    values = []
+    if ExifTags.IFD.Exif in ifd0:
+        exif_ifd = _read_ifd_tags(
+            tiff,
+            endian,
+            ifd0[ExifTags.IFD.Exif],
+            {ExifTags.Base.DateTimeOriginal},
+        )
+        values.append(exif_ifd.get(ExifTags.Base.DateTimeOriginal))
+    values.append(ifd0.get(ExifTags.Base.DateTime))
+    return [value for value in values if value]
+
+
 def _get_dateproperty_from_exif(path: str) -> DateProperty:
-    """Get DateTimeOriginal or DateTime from image EXIF metadata"""
+    """Get DateTimeOriginal or DateTime from image EXIF metadata
+
+    Raises OSError when the file cannot be read.
+    """
     dt = DateProperty(None, DateType.NO_DATA)
     try:
-        with Image.open(path) as img:
-            exif_data = img.getexif()
-            if not exif_data:
-                return DateProperty(None, DateType.NO_DATA)
-
-            for tag_id, value in exif_data.items():
-                tag = ExifTags.TAGS.get(tag_id, tag_id)
-                if tag == "DateTimeOriginal":
-                    return DateProperty(
-                        datetime.strptime(value, "%Y:%m:%d %H:%M:%S"),
-                        DateType.TAKEN,
-                    )
-                elif tag == "DateTime":
-                    dt = DateProperty(
-                        datetime.strptime(value, "%Y:%m:%d %H:%M:%S"),
-                        DateType.TAKEN,
-                    )
+        with open(path, "rb") as fp:
+            kind = _sniff_kind(fp.read(12))
+            if kind in (ImageKind.BMP, ImageKind.GIF):
+                return dt
+
+            if kind == ImageKind.JPEG:
+                try:
+                    values = _fast_jpeg_datetimes(fp)
+                except (struct.error, ValueError):
+                    pass
+                else:
+                    taken = _parse_first_exif_datetime(values)
+                    if not taken:
+                        return dt
+                    return DateProperty(taken, DateType.TAKEN)
+            fp.seek(0)
+
+            with Image.open(fp, formats=PIL_FORMATS.get(kind)) as img:
+                # PNG getexif() decodes the whole image to look for a trailing
+                # eXIf chunk, so only ask when one was seen before the pixels
+                if kind == ImageKind.PNG and not (
+                    "exif" in img.info or "Raw profile type exif" in img.info
+                ):
+                    return dt
+
+                exif_data = img.getexif()
+                if not exif_data:
+                    return DateProperty(None, DateType.NO_DATA)
+
+                # DateTimeOriginal lives in the Exif sub-IFD, DateTime in IFD0
+                exif_ifd = exif_data.get_ifd(ExifTags.IFD.Exif)
+                taken = _parse_first_exif_datetime(
+                    [
+                        exif_ifd.get(ExifTags.Base.DateTimeOriginal),
+                        exif_data.get(ExifTags.Base.DateTime),
+                    ]
+                )
+                if taken:
+                    return DateProperty(taken, DateType.TAKEN)
         return dt
+    except UnidentifiedImageError:
+        return dt
+    except OSError:
+        # The file could not be read (locked, no permission, offline), which
+        # says nothing about its EXIF data, so let the caller decide
+        raise
     except Exception:
         return dt
 
 
-def _get_dateproperty_from_system(path: str) -> DateProperty:
+@lru_cache(maxsize=4096)
+def _cached_dateproperty_from_exif(
+    path: str, mtime_ns: int, size: int
+) -> DateProperty:
+    """Memoize EXIF lookups; the stat fields drop entries for changed files"""
+    return _get_dateproperty_from_exif(path)
+
+
+def get_exif_dateproperty(path: str, st: os.stat_result) -> DateProperty:
+    """Get the memoized EXIF date; raises OSError when the file is unreadable"""
+    return _cached_dateproperty_from_exif(path, st.st_mtime_ns, st.st_size)
+
+
+def clear_datetime_cache() -> None:
+    """Forget all memoized EXIF lookups"""
+    _cached_dateproperty_from_exif.cache_clear()
+
+
+def _get_dateproperty_from_system(
+    path: str, st: os.stat_result | None = None
+) -> DateProperty:
     """Get file creation time or last modified time using filesystem metadata"""
-    path_ = Path(path)
     try:
-        ctime = datetime.fromtimestamp(path_.stat().st_ctime)
-        mtime = datetime.fromtimestamp(path_.stat().st_mtime)
+        if st is None:
+            st = os.stat(path)
+        ctime = datetime.fromtimestamp(st.st_ctime)
+        mtime = datetime.fromtimestamp(st.st_mtime)
 
         if ctime <= mtime:
             return DateProperty(ctime, DateType.CREATED)
@@ -92,13 +306,32 @@ def _get_dateproperty_from_system(path: str) -> DateProperty:
         return DateProperty(None, DateType.NO_DATA)
 
 
-def resolve_best_datetime(path: Path) -> DateProperty:
-    """Select the best available datetime in priority: EXIF > creation > modified"""
-    dpropety = _get_dateproperty_from_exif(path)
+def resolve_best_datetime(
+    path: Path,
+    st: os.stat_result | None = None,
+    exif: DateProperty | None = None,
+) -> DateProperty:
+    """Select the best available datetime in priority: EXIF > creation > modified
+
+    A known EXIF result for this stat (e.g. from a persistent cache) can be
+    passed as exif to skip reading the file.
+    """
+    if st is None:
+        try:
+            st = os.stat(path)
+        except OSError:
+            return DateProperty(None, DateType.NO_DATA)
+
+    if exif is None:
+        try:
+            exif = get_exif_dateproperty(path, st)
+        except OSError:
+            exif = DateProperty(None, DateType.NO_DATA)
+    dpropety = exif
     if dpropety.dtype != DateType.NO_DATA:
         return dpropety
     else:
-        return _get_dateproperty_from_system(path)
+        return _get_dateproperty_from_system(path, st)
 
 
 def format_filename_with_datetime(path: Path, dt: datetime) -> Path:
@@ -122,17 +355,94 @@ def rename_image_file(path: Path) -> Path | None:
 
 def batch_rename_images(paths: list[Path]) -> list[tuple[Path, Path | None]]:
     """Process a list of image files and rename them accordingly"""
-    return [(p, rename_image_file(p)) for p in paths]
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as ex:
+        return list(zip(paths, ex.map(rename_image_file, paths)))
+
+
+def path_key(path: str) -> str:
+    """Key for paths assigned in one batch, so case-only differences collide
 
+    Windows and macOS volumes are usually case-insensitive, where "D.JPG"
+    and "D.jpg" name the same file, and normcase does nothing on macOS.
+    """
+    return os.path.normcase(path).casefold()
 
-def get_unique_path(path: str, other_paths: list[str]) -> str:
-    """Generate a unique filename by appending a counter if necessary"""
+
+def get_unique_path(path: str, other_paths: set[str]) -> str:
+    """Generate a unique filename by appending a counter if necessary
+
+    other_paths holds the path_key of every path already assigned.
+    """
     dir_name, base = os.path.split(path)
     name, ext = os.path.splitext(base)
     counter = 1
     while True:
-        if os.path.exists(path) or path in other_paths:
+        if path_key(path) in other_paths or os.path.exists(path):
             path = posixpath.join(dir_name, f"{name} ({counter}){ext}")
             counter += 1
             continue
         return path
+
+
+def list_dir_names(dir_name: str) -> set[str]:
+    """List the case-normalized entry names of a directory in one scandir"""
+    with os.scandir(dir_name or ".") as it:
+        return {os.path.normcase(entry.name) for entry in it}
+
+
+def stat_files(paths: list[str]) -> list[tuple[str, os.stat_result]]:
+    """Stat the paths that are regular files, with one scandir per folder"""
+    by_dir: dict[str, set[str]] = {}
+    for path in paths:
+        dir_name, base = os.path.split(path)
+        by_dir.setdefault(dir_name, set()).add(base)
+
+    files: dict[tuple[str, str], os.stat_result] = {}
+    for dir_name, wanted in by_dir.items():
+        if len(wanted) == 1:
+            continue
+        try:
+            with os.scandir(dir_name or ".") as it:
+                for entry in it:
+                    if entry.name in wanted and entry.is_file():
+                        files[(dir_name, entry.name)] = entry.stat()
+        except OSError:
+            continue
+
+    # Single files, unreadable folders and names that differ from the
+    # listing (e.g. by case) fall back to an individual stat
+    result = []
+    for path in paths:
+        st = files.get(os.path.split(path))
+        if st is None:
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            if not stat.S_ISREG(st.st_mode):
+                continue
+        result.append((path, st))
+    return result
+
+
+def get_unique_path_fast(
+    path: str, existing_names: set[str], other_paths: set[str]
+) -> str:
+    """Like get_unique_path, but probe the disk only for the final candidate"""
+    dir_name, base = os.path.split(path)
+    name, ext = os.path.splitext(base)
+    counter = 1
+    while True:
+        if (
+            os.path.normcase(base) in existing_names
+            or path_key(path) in other_paths
+        ):
+            base = f"{name} ({counter}){ext}"
+            path = posixpath.join(dir_name, base)
+            counter += 1
+            continue
+        if os.path.exists(path):
+            # Created after the directory was listed
+            existing_names.add(os.path.normcase(base))
+            continue
+        return path
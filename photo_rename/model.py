@@ -1,14 +1,24 @@
 import os
+import posixpath
+import sqlite3
 from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
-from PySide6.QtCore import QObject, Signal
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, QTimer, Signal
 
+from photo_rename.cache import ExifCache
 from photo_rename.config import Config, try_save_config
 from photo_rename.filing import (
+    MAX_WORKERS,
+    DateProperty,
     DateType,
+    extract_base_name,
+    get_exif_dateproperty,
     get_unique_path,
-    replace_path_filename,
+    get_unique_path_fast,
+    list_dir_names,
+    path_key,
     resolve_best_datetime,
 )
 from photo_rename.shared import NamingMethod, RenameResult
@@ -22,86 +32,300 @@ PathMap = namedtuple(
     ],
 )
 
+CONFIG_SAVE_DELAY_MS = 500
+PROGRESS_STEP = 32
+
+NAME_BUILDERS = {
+    NamingMethod.DATE_ONLY: lambda name, date: date,
+    NamingMethod.DATE_BEFORE_ORIGINAL: lambda name, date: f"{date}{name}",
+    NamingMethod.DATE_AFTER_ORIGINAL: lambda name, date: f"{name}{date}",
+}
+
+
+def _rename(map_: PathMap) -> tuple[str, RenameResult]:
+    old_path = map_.original_path
+    new_path = map_.mapped_path
+    try:
+        if old_path != new_path:
+            os.rename(old_path, new_path)
+        return (old_path, RenameResult.SUCCESS)
+    except Exception:
+        return (old_path, RenameResult.FAILURE)
+
+
+def _resolve_datetime(
+    path: str, st: os.stat_result | None, cached: DateProperty | None
+) -> tuple[DateProperty, DateProperty | None]:
+    """Resolve one file, plus the EXIF result if it was freshly read"""
+    if cached is not None or st is None:
+        return (resolve_best_datetime(path, st, cached), None)
+    try:
+        exif = get_exif_dateproperty(path, st)
+    except OSError:
+        # Unreadable for now; a later read may succeed without a new stat
+        no_data = DateProperty(None, DateType.NO_DATA)
+        return (resolve_best_datetime(path, st, no_data), None)
+    return (resolve_best_datetime(path, st, exif), exif)
+
+
+class _ResolveDatetimesJob(QRunnable):
+    """Resolve file datetimes off the GUI thread and report back by signal"""
+
+    def __init__(
+        self,
+        generation: int,
+        entries: list[tuple[str, os.stat_result | None]],
+        exif_cache: ExifCache | None,
+        progress: Signal,
+        finished: Signal,
+    ) -> None:
+        super().__init__()
+        self.generation = generation
+        self.cancelled = False
+        self.__entries = entries
+        self.__exif_cache = exif_cache
+        self.__progress = progress
+        self.__finished = finished
+
+    def run(self) -> None:
+        dproperties = []
+        try:
+            self._resolve(dproperties)
+        finally:
+            # Always report back, or the model would wait for this run forever
+            if not self.cancelled:
+                missing = len(self.__entries) - len(dproperties)
+                no_data = DateProperty(None, DateType.NO_DATA)
+                dproperties.extend([no_data] * missing)
+                self.__finished.emit(self.generation, dproperties)
+
+    def _resolve(self, dproperties: list[DateProperty]) -> None:
+        n_paths = len(self.__entries)
+        paths = [path for path, _ in self.__entries]
+        stats = [st for _, st in self.__entries]
+        exifs = self._load_cached()
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as ex:
+            results = ex.map(_resolve_datetime, paths, stats, exifs)
+            read_exifs = []
+            for i, (dproperty, read_exif) in enumerate(results, 1):
+                if self.cancelled:
+                    ex.shutdown(wait=False, cancel_futures=True)
+                    break
+                dproperties.append(dproperty)
+                read_exifs.append(read_exif)
+                if i % PROGRESS_STEP == 0 or i == n_paths:
+                    self.__progress.emit(self.generation, i, n_paths)
+
+        self._store_resolved(
+            [
+                (path, st, exif)
+                for path, st, exif in zip(paths, stats, read_exifs)
+                if exif is not None
+            ]
+        )
+
+    def _load_cached(self) -> list[DateProperty | None]:
+        if self.__exif_cache is not None:
+            try:
+                return self.__exif_cache.get_many(self.__entries)
+            except sqlite3.Error:
+                pass
+        return [None] * len(self.__entries)
+
+    def _store_resolved(
+        self, resolved: list[tuple[str, os.stat_result, DateProperty]]
+    ) -> None:
+        if self.__exif_cache is None or not resolved:
+            return
+        try:
+            self.__exif_cache.put_many(resolved)
+        except sqlite3.Error:
+            pass
+
 
 class MainWindowModel(QObject):
     path_map_created = Signal(list)
     path_map_updated = Signal(int, PathMap)
+    path_map_progress = Signal(int, int)
+
+    # Emitted from the worker thread, delivered queued on the GUI thread
+    _datetimes_progress = Signal(int, int, int)
+    _datetimes_resolved = Signal(int, list)
 
-    def __init__(self, config: Config) -> None:
+    def __init__(
+        self, config: Config, exif_cache: ExifCache | None = None
+    ) -> None:
         super().__init__()
         self.__config = config
+        self.__exif_cache = exif_cache
 
         self._path_map: list[PathMap] = []
+        self._rows: list[tuple[str, str, DateType]] = []
         self._paths: list[str] = []
+        self._dir_names: dict[str, set[str]] = {}
 
-    def create_path_map(self, paths: str) -> None:
+        self.__generation = 0
+        self.__job: _ResolveDatetimesJob | None = None
+        self.__pending_paths: list[str] | None = None
+        self._datetimes_progress.connect(self._on_datetimes_progress)
+        self._datetimes_resolved.connect(self._on_datetimes_resolved)
+
+        self.__config_dirty = False
+        self.__save_timer = QTimer(self)
+        self.__save_timer.setSingleShot(True)
+        self.__save_timer.setInterval(CONFIG_SAVE_DELAY_MS)
+        self.__save_timer.timeout.connect(self.flush_config)
+
+    def create_path_map(
+        self, entries: list[tuple[str, os.stat_result | None]]
+    ) -> None:
+        self.cancel_path_map()
+        self.__generation += 1
+        self.__pending_paths = [path for path, _ in entries]
+        self.__job = _ResolveDatetimesJob(
+            self.__generation,
+            entries,
+            self.__exif_cache,
+            self._datetimes_progress,
+            self._datetimes_resolved,
+        )
+        QThreadPool.globalInstance().start(self.__job)
+
+    def cancel_path_map(self) -> None:
+        if self.__job is not None:
+            self.__job.cancelled = True
+        self.__job = None
+        self.__pending_paths = None
+
+    def _on_datetimes_progress(
+        self, generation: int, done: int, total: int
+    ) -> None:
+        if generation == self.__generation and self.__job is not None:
+            self.path_map_progress.emit(done, total)
+
+    def _on_datetimes_resolved(
+        self, generation: int, dproperties: list[DateProperty]
+    ) -> None:
+        if generation != self.__generation or self.__job is None:
+            return
+        paths = self.__pending_paths
+        self.__job = None
+        self.__pending_paths = None
+        self._build_path_map(paths, dproperties)
+
+    def _build_path_map(
+        self, paths: list[str], dproperties: list[DateProperty]
+    ) -> None:
         map_ = []
-        other_paths = []
-        for path in paths:
-            dproperty = resolve_best_datetime(path)
+        rows = []
+        other_paths = set()
+        self._dir_names = {}
+        date_format = self.__config.date_format
+        build_name = NAME_BUILDERS[self.__config.naming_method]
+        for path, dproperty in zip(paths, dproperties):
+            dir_name, base = os.path.split(path)
+            name, ext = os.path.splitext(base)
+            new_path = path
+            new_name = name
             if dproperty.dtype != DateType.NO_DATA:
-                f_date = dproperty.dt.strftime(self.__config.date_format)
-
-                method = self.__config.naming_method
-                if method == NamingMethod.DATE_ONLY:
-                    new_path = replace_path_filename(path, f"{f_date}")
-                elif method == NamingMethod.DATE_BEFORE_ORIGINAL:
-                    new_path = replace_path_filename(path, f"{f_date}{{name}}")
-                elif method == NamingMethod.DATE_AFTER_ORIGINAL:
-                    new_path = replace_path_filename(path, f"{{name}}{f_date}")
-
-                if path != new_path:
-                    new_path = get_unique_path(new_path, other_paths)
-                else:
-                    new_path = path
-            else:
-                new_path = path
+                f_date = dproperty.dt.strftime(date_format)
+                f_name = build_name(name, f_date)
+                candidate = posixpath.join(dir_name, f"{f_name}{ext}")
+
+                if path != candidate:
+                    new_path = self._get_unique_path(candidate, other_paths)
+                    new_name = extract_base_name(new_path)
 
             map_.append(PathMap(path, new_path, dproperty.dtype))
-            other_paths.append(new_path)
+            rows.append((name, new_name, dproperty.dtype))
+            other_paths.add(path_key(new_path))
 
         self._path_map = map_
+        self._rows = rows
         self._paths = paths
-        self.path_map_created.emit(map_)
+        self.path_map_created.emit(rows)
 
     def update_path_map(self, index: int, new_path: str) -> None:
         original_path = self._path_map[index].original_path
         if new_path != original_path:
-            other_paths = [
-                path for i, path in enumerate(self._path_map) if i != index
-            ]
-            new_path = get_unique_path(new_path, other_paths)
+            other_paths = {
+                path_key(map_.mapped_path)
+                for i, map_ in enumerate(self._path_map)
+                if i != index
+            }
+            new_path = self._get_unique_path(new_path, other_paths)
         new_map = PathMap(original_path, new_path, DateType.MANUAL)
 
         self._path_map[index] = new_map
+        self._rows[index] = (
+            self._rows[index][0],
+            extract_base_name(new_path),
+            DateType.MANUAL,
+        )
         self.path_map_updated.emit(index, new_map)
 
     def delete_path_map(self, indices: list[int]) -> None:
         for index in sorted(indices, reverse=True):
             self._path_map.pop(index)
+            self._rows.pop(index)
             self._paths.pop(index)
-        self.path_map_created.emit(self._path_map)
+        self.path_map_created.emit(self._rows)
 
     def apply_path_map(self, index: int) -> tuple[str, RenameResult]:
         map_ = self._path_map[index]
-        old_path = map_.original_path
-        new_path = map_.mapped_path
-        try:
-            if old_path != new_path:
-                os.rename(old_path, new_path)
-            return (old_path, RenameResult.SUCCESS)
-        except Exception:
-            return (old_path, RenameResult.FAILURE)
+        result = _rename(map_)
+        self._forget_dir_names([map_])
+        return result
+
+    def apply_all_path_maps(self) -> list[tuple[str, RenameResult]]:
+        maps = list(self._path_map)
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as ex:
+            results = list(ex.map(_rename, maps))
+        self._forget_dir_names(maps)
+        return results
+
+    def _forget_dir_names(self, maps: list[PathMap]) -> None:
+        for map_ in maps:
+            if map_.original_path != map_.mapped_path:
+                self._dir_names.pop(os.path.dirname(map_.original_path), None)
+                self._dir_names.pop(os.path.dirname(map_.mapped_path), None)
+
+    def _get_unique_path(self, path: str, other_paths: set[str]) -> str:
+        dir_name = os.path.dirname(path)
+        if dir_name not in self._dir_names:
+            try:
+                self._dir_names[dir_name] = list_dir_names(dir_name)
+            except OSError:
+                return get_unique_path(path, other_paths)
+        return get_unique_path_fast(
+            path, self._dir_names[dir_name], other_paths
+        )
 
     def get_path_map(self, index: int) -> PathMap:
         return self._path_map[index]
 
     def get_paths(self) -> list[str]:
+        if self.__pending_paths is not None:
+            return self.__pending_paths
         return self._paths
 
+    def is_loading(self) -> bool:
+        return self.__job is not None
+
     def get_n_files(self) -> int:
         return len(self._paths)
 
+    def flush_config(self) -> None:
+        self.__save_timer.stop()
+        if not self.__config_dirty:
+            return
+        self.__config_dirty = False
+        try_save_config(self.__config)
+
+    def _schedule_config_save(self) -> None:
+        self.__config_dirty = True
+        self.__save_timer.start()
+
     @property
     def date_format(self) -> str:
         return self.__config.date_format
@@ -109,7 +333,7 @@ class MainWindowModel(QObject):
     @date_format.setter
     def date_format(self, value: str) -> None:
         self.__config.date_format = value
-        try_save_config(self.__config)
+        self._schedule_config_save()
 
     @property
     def naming_method(self) -> NamingMethod:
@@ -118,7 +342,7 @@ class MainWindowModel(QObject):
     @naming_method.setter
     def naming_method(self, value: NamingMethod) -> None:
         self.__config.naming_method = value
-        try_save_config(self.__config)
+        self._schedule_config_save()
 
     @property
     def last_opened_folder(self) -> Path:
@@ -127,4 +351,4 @@ class MainWindowModel(QObject):
     @last_opened_folder.setter
     def last_opened_folder(self, value: Path) -> None:
         self.__config.last_opened_folder = value
-        try_save_config(self.__config)
+        self._schedule_config_save()
@@ -0,0 +1,160 @@
+# -*- coding: utf-8 -*-
+
+################################################################################
+## Form generated from reading UI file 'main_window.ui'
+##
+## Created by: Qt User Interface Compiler version 6.9.0
+##
+## WARNING! All changes made in this file will be lost when recompiling UI file!
+################################################################################
+
+from PySide6.QtCore import (QCoreApplication, QDate, QDateTime, QLocale,
+    QMetaObject, QObject, QPoint, QRect,
+    QSize, QTime, QUrl, Qt)
+from PySide6.QtGui import (QBrush, QColor, QConicalGradient, QCursor,
+    QFont, QFontDatabase, QGradient, QIcon,
+    QImage, QKeySequence, QLinearGradient, QPainter,
+    QPalette, QPixmap, QRadialGradient, QTransform)
+from PySide6.QtWidgets import (QAbstractItemView, QApplication, QGridLayout, QHBoxLayout,
+    QHeaderView, QLabel, QLineEdit, QPushButton,
+    QRadioButton, QSizePolicy, QSpacerItem, QTableView,
+    QVBoxLayout, QWidget)
+
+class Ui_Form(object):
+    def setupUi(self, Form):
+        if not Form.objectName():
+            Form.setObjectName(u"Form")
+        Form.resize(800, 400)
+        Form.setMinimumSize(QSize(800, 400))
+        self.horizontalLayout = QHBoxLayout(Form)
+        self.horizontalLayout.setObjectName(u"horizontalLayout")
+        self.gridLayout_2 = QGridLayout()
+        self.gridLayout_2.setSpacing(12)
+        self.gridLayout_2.setObjectName(u"gridLayout_2")
+        self.gridLayout_2.setContentsMargins(6, 6, 6, 6)
+        self.btnReset = QPushButton(Form)
+        self.btnReset.setObjectName(u"btnReset")
+        sizePolicy = QSizePolicy(QSizePolicy.Policy.Fixed, QSizePolicy.Policy.Fixed)
+        sizePolicy.setHorizontalStretch(0)
+        sizePolicy.setVerticalStretch(0)
+        sizePolicy.setHeightForWidth(self.btnReset.sizePolicy().hasHeightForWidth())
+        self.btnReset.setSizePolicy(sizePolicy)
+
+        self.gridLayout_2.addWidget(self.btnReset, 0, 2, 1, 1)
+
+        self.lblNumFiles = QLabel(Form)
+        self.lblNumFiles.setObjectName(u"lblNumFiles")
+        self.lblNumFiles.setAlignment(Qt.AlignmentFlag.AlignLeading|Qt.AlignmentFlag.AlignLeft|Qt.AlignmentFlag.AlignVCenter)
+
+        self.gridLayout_2.addWidget(self.lblNumFiles, 0, 1, 1, 1)
+
+        self.tblFileNames = QTableView(Form)
+        self.tblFileNames.setObjectName(u"tblFileNames")
+        self.tblFileNames.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.tblFileNames.setVerticalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
+        self.tblFileNames.setHorizontalScrollMode(QAbstractItemView.ScrollMode.ScrollPerPixel)
+        self.tblFileNames.setSortingEnabled(True)
+        self.tblFileNames.horizontalHeader().setDefaultSectionSize(188)
+        self.tblFileNames.horizontalHeader().setStretchLastSection(True)
+        self.tblFileNames.verticalHeader().setVisible(False)
+
+        self.gridLayout_2.addWidget(self.tblFileNames, 1, 0, 1, 3)
+
+        self.btnSelectFiles = QPushButton(Form)
+        self.btnSelectFiles.setObjectName(u"btnSelectFiles")
+        sizePolicy.setHeightForWidth(self.btnSelectFiles.sizePolicy().hasHeightForWidth())
+        self.btnSelectFiles.setSizePolicy(sizePolicy)
+
+        self.gridLayout_2.addWidget(self.btnSelectFiles, 0, 0, 1, 1)
+
+
+        self.horizontalLayout.addLayout(self.gridLayout_2)
+
+        self.verticalLayout = QVBoxLayout()
+        self.verticalLayout.setSpacing(6)
+        self.verticalLayout.setObjectName(u"verticalLayout")
+        self.verticalLayout.setContentsMargins(6, 10, 6, 6)
+        self.label_2 = QLabel(Form)
+        self.label_2.setObjectName(u"label_2")
+        self.label_2.setAlignment(Qt.AlignmentFlag.AlignLeading|Qt.AlignmentFlag.AlignLeft|Qt.AlignmentFlag.AlignVCenter)
+
+        self.verticalLayout.addWidget(self.label_2)
+
+        self.txtDateFormat = QLineEdit(Form)
+        self.txtDateFormat.setObjectName(u"txtDateFormat")
+
+        self.verticalLayout.addWidget(self.txtDateFormat)
+
+        self.label_4 = QLabel(Form)
+        self.label_4.setObjectName(u"label_4")
+        self.label_4.setAlignment(Qt.AlignmentFlag.AlignLeading|Qt.AlignmentFlag.AlignLeft|Qt.AlignmentFlag.AlignVCenter)
+
+        self.verticalLayout.addWidget(self.label_4)
+
+        self.verticalSpacer_2 = QSpacerItem(20, 20, QSizePolicy.Policy.Minimum, QSizePolicy.Policy.Fixed)
+
+        self.verticalLayout.addItem(self.verticalSpacer_2)
+
+        self.label_3 = QLabel(Form)
+        self.label_3.setObjectName(u"label_3")
+        self.label_3.setAlignment(Qt.AlignmentFlag.AlignLeading|Qt.AlignmentFlag.AlignLeft|Qt.AlignmentFlag.AlignVCenter)
+
+        self.verticalLayout.addWidget(self.label_3)
+
+        self.rbtnDateOnly = QRadioButton(Form)
+        self.rbtnDateOnly.setObjectName(u"rbtnDateOnly")
+        self.rbtnDateOnly.setChecked(True)
+
+        self.verticalLayout.addWidget(self.rbtnDateOnly)
+
+        self.rbtnDateBefOri = QRadioButton(Form)
+        self.rbtnDateBefOri.setObjectName(u"rbtnDateBefOri")
+
+        self.verticalLayout.addWidget(self.rbtnDateBefOri)
+
+        self.rbtnDateAftOri = QRadioButton(Form)
+        self.rbtnDateAftOri.setObjectName(u"rbtnDateAftOri")
+
+        self.verticalLayout.addWidget(self.rbtnDateAftOri)
+
+        self.verticalSpacer = QSpacerItem(20, 20, QSizePolicy.Policy.Minimum, QSizePolicy.Policy.MinimumExpanding)
+
+        self.verticalLayout.addItem(self.verticalSpacer)
+
+        self.btnApply = QPushButton(Form)
+        self.btnApply.setObjectName(u"btnApply")
+
+        self.verticalLayout.addWidget(self.btnApply)
+
+
+        self.horizontalLayout.addLayout(self.verticalLayout)
+
+        self.horizontalLayout.setStretch(0, 3)
+        self.horizontalLayout.setStretch(1, 1)
+
+        self.retranslateUi(Form)
+
+        QMetaObject.connectSlotsByName(Form)
+    # setupUi
+
+    def retranslateUi(self, Form):
+        Form.setWindowTitle(QCoreApplication.translate("Form", u"Form", None))
+        self.btnReset.setText(QCoreApplication.translate("Form", u"\u30ea\u30bb\u30c3\u30c8", None))
+        self.lblNumFiles.setText("")
+        self.btnSelectFiles.setText(QCoreApplication.translate("Form", u"\u30d5\u30a1\u30a4\u30eb\u3092\u9078\u629e", None))
+        self.label_2.setText(QCoreApplication.translate("Form", u"\u65e5\u6642\u306e\u5f62\u5f0f", None))
+        self.txtDateFormat.setText(QCoreApplication.translate("Form", u"YYYY-MM-DD_hhmmss", None))
+        self.label_4.setText(QCoreApplication.translate("Form", u"  Y : \u5e74(4\u6841)\n"
+"  y : \u5e74(\u4e0b2\u6841)\n"
+"  m : \u6708\n"
+"  d : \u65e5\n"
+"  H : \u6642\n"
+"  M : \u5206\n"
+"  S : \u79d2", None))
+        self.label_3.setText(QCoreApplication.translate("Form", u"\u30d5\u30a1\u30a4\u30eb\u540d\u306e\u5f62\u5f0f", None))
+        self.rbtnDateOnly.setText(QCoreApplication.translate("Form", u"\u65e5\u6642\u306e\u307f", None))
+        self.rbtnDateBefOri.setText(QCoreApplication.translate("Form", u"\u5143\u306e\u30d5\u30a1\u30a4\u30eb\u540d\u306e\u524d\u306b\u65e5\u6642", None))
+        self.rbtnDateAftOri.setText(QCoreApplication.translate("Form", u"\u5143\u306e\u30d5\u30a1\u30a4\u30eb\u540d\u306e\u5f8c\u306b\u65e5\u6642", None))
+        self.btnApply.setText(QCoreApplication.translate("Form", u"\u5909\u66f4\u3092\u9069\u7528", None))
+    # retranslateUi
+
@@ -1,69 +1,125 @@
-from PySide6.QtCore import QFile, Qt
-from PySide6.QtUiTools import QUiLoader
+from PySide6.QtCore import (
+    QAbstractTableModel,
+    QModelIndex,
+    QSortFilterProxyModel,
+    Qt,
+    Signal,
+)
 from PySide6.QtWidgets import (
     QButtonGroup,
     QFileDialog,
     QHeaderView,
-    QLabel,
-    QLineEdit,
     QMainWindow,
     QMessageBox,
-    QPushButton,
-    QRadioButton,
-    QTableWidget,
-    QTableWidgetItem,
+    QWidget,
 )
 
 from photo_rename.filing import extract_base_name, extract_invalid_chars
 from photo_rename.shared import RenameResult
+from photo_rename.ui_main_window import Ui_Form
 from photo_rename.vm import MainWindowViewModel
 
+TABLE_HEADERS = ["変更前", "変更後（編集可）", "日時"]
+
+
+class FileNameTableModel(QAbstractTableModel):
+    name_edited = Signal(int, str)
+
+    def __init__(self, headers: list[str]) -> None:
+        super().__init__()
+        self.__headers = headers
+        self.__rows: list[tuple[str, ...]] = []
+
+    def reset(self, rows: list[tuple[str, ...]]) -> None:
+        self.beginResetModel()
+        self.__rows = rows
+        self.endResetModel()
+
+    def update_row(self, row: int, data: list[str]) -> None:
+        self.__rows[row] = (self.__rows[row][0], *data)
+        self.dataChanged.emit(
+            self.index(row, 1), self.index(row, len(self.__headers) - 1)
+        )
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.__rows)
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.__headers)
+
+    def data(
+        self, index: QModelIndex, role: int = Qt.DisplayRole
+    ) -> str | None:
+        if role in (Qt.DisplayRole, Qt.EditRole):
+            return self.__rows[index.row()][index.column()]
+        return None
+
+    def setData(
+        self, index: QModelIndex, value: str, role: int = Qt.EditRole
+    ) -> bool:
+        if role != Qt.EditRole or index.column() != 1:
+            return False
+        # The resolved name comes back through update_row
+        self.name_edited.emit(index.row(), value)
+        return True
+
+    def flags(self, index: QModelIndex) -> Qt.ItemFlags:
+        flags = super().flags(index)
+        if index.column() == 1:
+            flags |= Qt.ItemIsEditable
+        return flags
+
+    def headerData(
+        self,
+        section: int,
+        orientation: Qt.Orientation,
+        role: int = Qt.DisplayRole,
+    ) -> str | None:
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.__headers[section]
+        return None
+
 
 class MainWindow(QMainWindow):
 
-    def __init__(self, vm: MainWindowViewModel, ui_file: QFile) -> None:
+    def __init__(self, vm: MainWindowViewModel) -> None:
         super().__init__()
         self.__vm = vm
-        self.__ui_file = ui_file
         self._init_ui()
 
         self.__vm.table_created.connect(self._on_table_created)
         self.__vm.table_updated.connect(self._on_table_updated)
+        self.__vm.table_progress.connect(self._on_table_progress)
         self.__vm.rename_completed.connect(self._on_rename_completed)
 
     def _init_ui(self) -> None:
-        self.__ui_file.open(QFile.ReadOnly)
-        ui = QUiLoader().load(self.__ui_file, self)
-        self.__ui_file.close()
-        self.setCentralWidget(ui)
-
-        self.button_select_files = ui.findChild(QPushButton, "btnSelectFiles")
-        self.button_reset = ui.findChild(QPushButton, "btnReset")
-        self.button_apply = ui.findChild(QPushButton, "btnApply")
-        self.label_num_files = ui.findChild(QLabel, "lblNumFiles")
-        self.table_file_names = ui.findChild(QTableWidget, "tblFileNames")
-        self.text_date_format = ui.findChild(QLineEdit, "txtDateFormat")
+        form = QWidget(self)
+        ui = Ui_Form()
+        ui.setupUi(form)
+        self.setCentralWidget(form)
+
+        self.button_select_files = ui.btnSelectFiles
+        self.button_reset = ui.btnReset
+        self.button_apply = ui.btnApply
+        self.label_num_files = ui.lblNumFiles
+        self.table_file_names = ui.tblFileNames
+        self.text_date_format = ui.txtDateFormat
         self.radio_group = QButtonGroup()
-        self.radio_group.addButton(
-            ui.findChild(QRadioButton, "rbtnDateOnly"),
-            id=0,
-        )
-        self.radio_group.addButton(
-            ui.findChild(QRadioButton, "rbtnDateAftOri"),
-            id=1,
-        )
-        self.radio_group.addButton(
-            ui.findChild(QRadioButton, "rbtnDateBefOri"),
-            id=2,
-        )
-
+        self.radio_group.addButton(ui.rbtnDateOnly, id=0)
+        self.radio_group.addButton(ui.rbtnDateAftOri, id=1)
+        self.radio_group.addButton(ui.rbtnDateBefOri, id=2)
+
+        self.table_model = FileNameTableModel(TABLE_HEADERS)
+        self.table_proxy = QSortFilterProxyModel(self)
+        self.table_proxy.setSourceModel(self.table_model)
+        self.table_file_names.setModel(self.table_proxy)
         self.table_file_names.horizontalHeader().setSectionResizeMode(
             QHeaderView.Stretch
         )
 
         self.button_select_files.clicked.connect(self._on_file_button_clicked)
         self.button_reset.clicked.connect(self._on_reset_button_clicked)
-        self.table_file_names.itemChanged.connect(self._on_table_item_changed)
+        self.table_model.name_edited.connect(self._on_table_name_edited)
         self.text_date_format.editingFinished.connect(self._on_date_fmt_changed)
         self.radio_group.idClicked.connect(self._on_radio_clicked)
         self.button_apply.clicked.connect(self._on_apply_button_clicked)
@@ -86,33 +142,12 @@ class MainWindow(QMainWindow):
             self.__vm.update_paths(file_paths)
             self.__vm.set_last_opened_folder(dialog.directory().absolutePath())
 
-    def _on_table_item_changed(self, item: QTableWidgetItem) -> None:
-        self.__vm.update_table_data(item.data(Qt.UserRole), item.text())
+    def _on_table_name_edited(self, index: int, text: str) -> None:
+        self.__vm.update_table_data(index, text)
 
-    def _on_table_created(self, table: list[str]) -> None:
+    def _on_table_created(self, table: list[tuple[str, ...]]) -> None:
         n_rows = len(table)
-        self.table_file_names.blockSignals(True)
-        self.table_file_names.setSortingEnabled(False)
-        self.table_file_names.clearContents()
-        self.table_file_names.setRowCount(0)
-
-        self.table_file_names.setColumnCount(3)
-        self.table_file_names.setRowCount(n_rows)
-
-        for index, row in enumerate(table):
-            items = []
-            for icol, data in enumerate(row):
-                item = QTableWidgetItem(data)
-                item.setData(Qt.UserRole, index)
-                if icol == 1:
-                    item.setFlags(item.flags() | Qt.ItemIsEditable)
-                else:
-                    item.setFlags(item.flags() & ~Qt.ItemIsEditable)
-                self.table_file_names.setItem(index, icol, item)
-                items.append(item)
-
-        self.table_file_names.setSortingEnabled(True)
-        self.table_file_names.blockSignals(False)
+        self.table_model.reset(table)
 
         if n_rows > 0:
             self.label_num_files.setText(f"選択済み: {n_rows} ファイル")
@@ -120,21 +155,10 @@ class MainWindow(QMainWindow):
             self.label_num_files.setText("")
 
     def _on_table_updated(self, index: int, data: list[str]) -> None:
-        self.table_file_names.blockSignals(True)
-        self.table_file_names.setSortingEnabled(False)
-
-        for irow in range(self.table_file_names.rowCount()):
-            item1 = self.table_file_names.item(irow, 1)
-            item2 = self.table_file_names.item(irow, 2)
-            if item1.data(Qt.UserRole) != index:
-                continue
-
-            item1.setText(data[0])
-            item2.setText(data[1])
-            break
+        self.table_model.update_row(index, data)
 
-        self.table_file_names.setSortingEnabled(True)
-        self.table_file_names.blockSignals(False)
+    def _on_table_progress(self, done: int, total: int) -> None:
+        self.label_num_files.setText(f"読み込み中: {done} / {total} ファイル")
 
     def _on_date_fmt_changed(self) -> None:
         text = self.text_date_format.text()
@@ -164,7 +188,7 @@ class MainWindow(QMainWindow):
         self.__vm.refresh_paths()
 
     def _on_apply_button_clicked(self) -> None:
-        if self.__vm.get_n_files() == 0:
+        if self.__vm.is_loading() or self.__vm.get_n_files() == 0:
             return
 
         reply = QMessageBox.question(
@@ -1,30 +1,58 @@
-import os.path
+from os.path import abspath, normcase, splitext
 from pathlib import Path
 
-from PySide6.QtCore import QObject, Signal
+from PySide6.QtCore import QObject, Qt, Signal
 
 from photo_rename.filing import (
     DateType,
+    clear_datetime_cache,
     extract_base_name,
     format_datestr,
     parse_datestr,
     replace_path_filename,
+    stat_files,
 )
 from photo_rename.model import MainWindowModel, PathMap
 from photo_rename.shared import NamingMethod
 
+DISPLAYED_DATE_TYPE: dict[DateType, str] = {
+    DateType.TAKEN: "撮影日",
+    DateType.CREATED: "保存日",
+    DateType.MODIFIED: "更新日",
+    DateType.MANUAL: "修正済み",
+    DateType.NO_DATA: "(情報なし)",
+}
+_ALL_TYPES = ["jpg", "jpeg", "png", "bmp", "gif", "heic", "heif"]
+_FILTER_DICT: dict[str, list[str]] = {
+    "すべての画像ファイル": _ALL_TYPES,
+    "HEIFファイル": ["heic", "heif"],
+    "JPEGファイル ": ["jpg", "jpeg"],
+    "PNGファイル ": ["png"],
+    "BMPファイル ": ["bmp"],
+    "GIFファイル ": ["gif"],
+}
+
 
 class MainWindowViewModel(QObject):
 
     table_created = Signal(list)
     table_updated = Signal(int, list)
+    table_progress = Signal(int, int)
     rename_completed = Signal(list)
 
     def __init__(self, model: MainWindowModel) -> None:
         super().__init__()
         self.__model = model
-        self.__model.path_map_created.connect(self._on_path_map_created)
-        self.__model.path_map_updated.connect(self._on_path_map_updated)
+        self.__last_folder: tuple[Path, str] | None = None
+        self.__model.path_map_created.connect(
+            self._on_path_map_created, Qt.DirectConnection
+        )
+        self.__model.path_map_updated.connect(
+            self._on_path_map_updated, Qt.DirectConnection
+        )
+        self.__model.path_map_progress.connect(
+            self.table_progress, Qt.DirectConnection
+        )
 
     def get_type_filter(self) -> str:
         return FileTypes.get_all_filters()
@@ -33,11 +61,22 @@ class MainWindowViewModel(QObject):
         return FileTypes.get_filter("すべての画像ファイル")
 
     def update_paths(self, paths: list[str]) -> None:
-        paths_ = []
+        # Overlapping selections can name one file several ways
+        unique: dict[str, str] = {}
         for p in paths:
-            if os.path.isfile(p) and p.split(".")[1] in FileTypes.get_types():
-                paths_.append(p)
-        self.__model.create_path_map(paths)
+            unique.setdefault(normcase(abspath(p)), p)
+
+        type_set = FileTypes.get_type_set()
+        entries = stat_files(
+            [
+                p
+                for p in unique.values()
+                if splitext(p)[1][1:].lower() in type_set
+            ]
+        )
+        if [p for p, _ in entries] != self.__model.get_paths():
+            clear_datetime_cache()
+        self.__model.create_path_map(entries)
 
     def refresh_paths(self) -> None:
         self.update_paths(self.__model.get_paths())
@@ -46,9 +85,11 @@ class MainWindowViewModel(QObject):
         map_ = self.__model.get_path_map(index)
         if new_name == "":
             self.__model.update_path_map(index, map_.mapped_path)
-        else:
-            new_path = replace_path_filename(map_.original_path, new_name)
-            self.__model.update_path_map(index, new_path)
+            return
+        if new_name == extract_base_name(map_.mapped_path):
+            return
+        new_path = replace_path_filename(map_.original_path, new_name)
+        self.__model.update_path_map(index, new_path)
 
     def delete_table_data(self, indices: list[int]) -> None:
         self.__model.delete_path_map(indices)
@@ -66,79 +107,65 @@ class MainWindowViewModel(QObject):
         return self.__model.naming_method.value
 
     def set_last_opened_folder(self, path: str) -> None:
-        self.__model.last_opened_folder = Path(path)
+        if self.__last_folder is not None and path == self.__last_folder[1]:
+            return
+        folder = Path(path)
+        self.__model.last_opened_folder = folder
+        self.__last_folder = (folder, folder.as_posix())
 
     def get_last_opened_folder(self) -> str:
-        return self.__model.last_opened_folder.as_posix()
+        folder = self.__model.last_opened_folder
+        if self.__last_folder is None or self.__last_folder[0] is not folder:
+            self.__last_folder = (folder, folder.as_posix())
+        return self.__last_folder[1]
 
     def get_n_files(self) -> int:
         return self.__model.get_n_files()
 
-    def apply_renaming(self) -> None:
-        results = []
-        for i in range(self.get_n_files()):
-            ret = self.__model.apply_path_map(i)
-            results.append(ret)
+    def is_loading(self) -> bool:
+        return self.__model.is_loading()
 
+    def apply_renaming(self) -> None:
+        results = self.__model.apply_all_path_maps()
         self.rename_completed.emit(results)
 
-    def _on_path_map_created(self, mappings: list[PathMap]) -> None:
-        data = []
-        for map_ in mappings:
-            ori_name = extract_base_name(map_.original_path)
-            new_name = extract_base_name(map_.mapped_path)
-            dtype = DisplayedDateType.get(map_.dtype)
-            data.append([ori_name, new_name, dtype])
-
+    def _on_path_map_created(
+        self, rows: list[tuple[str, str, DateType]]
+    ) -> None:
+        label = DISPLAYED_DATE_TYPE.__getitem__
+        data = [
+            (ori_name, new_name, label(dtype))
+            for ori_name, new_name, dtype in rows
+        ]
         self.table_created.emit(data)
 
     def _on_path_map_updated(self, index: int, map_: PathMap) -> None:
         new_name = extract_base_name(map_.mapped_path)
-        new_dtype = DisplayedDateType.get(map_.dtype)
+        new_dtype = DISPLAYED_DATE_TYPE[map_.dtype]
         self.table_updated.emit(index, [new_name, new_dtype])
 
 
-class DisplayedDateType:
-
-    __dict = {
-        DateType.TAKEN: "撮影日",
-        DateType.CREATED: "保存日",
-        DateType.MODIFIED: "更新日",
-        DateType.MANUAL: "修正済み",
-        DateType.NO_DATA: "(情報なし)",
-    }
-
-    @classmethod
-    def get(cls, key: DateType) -> str:
-        return cls.__dict[key]
-
-
 class FileTypes:
 
-    __all = ["jpg", "jpeg", "png", "bmp", "gif", "heic", "heif"]
-    __dict = {
-        "すべての画像ファイル": __all,
-        "HEIFファイル": ["heic", "heif"],
-        "JPEGファイル ": ["jpg", "jpeg"],
-        "PNGファイル ": ["png"],
-        "BMPファイル ": ["bmp"],
-        "GIFファイル ": ["gif"],
+    __type_set = frozenset(_ALL_TYPES)
+    __filter_by_name = {
+        name: f"{name} ({' '.join('*.' + s for s in suffixes)})"
+        for name, suffixes in _FILTER_DICT.items()
     }
+    __all_filters = "".join(f";;{f}" for f in __filter_by_name.values())
 
     @classmethod
     def get_all_filters(cls) -> str:
-        filter_str = ""
-        for name, suffixes in cls.__dict.items():
-            suffix_str = " *.".join(suffixes)
-            filter_str += f";;{name} ({suffix_str})"
-        return filter_str
+        return cls.__all_filters
 
     @classmethod
     def get_filter(cls, name: str) -> str:
-        suffixes = cls.__dict[name]
-        suffix_str = " *.".join(suffixes)
-        return f"{name} ({suffix_str})"
+        return cls.__filter_by_name[name]
 
     @classmethod
     def get_types(cls) -> list[str]:
-        return cls.__all
+        return _ALL_TYPES
+
+    @classmethod
+    def get_type_set(cls) -> frozenset[str]:
+        return cls.__type_set
@@ -0,0 +1,62 @@
+import os
+import sqlite3
+from datetime import datetime
+
+import pytest
+
+from photo_rename.filing import DateProperty, DateType
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    monkeypatch.setenv("APPDATA", str(tmp_path))
+    from photo_rename.cache import ExifCache
+
+    cache = ExifCache(tmp_path / "exif_cache.sqlite")
+    yield cache
+    cache.close()
+
+
+@pytest.fixture
+def photo(tmp_path):
+    path = tmp_path / "a.jpg"
+    path.write_bytes(b"\xff\xd8")
+    return str(path), os.stat(path)
+
+
+def test_round_trip(cache, photo):
+    path, st = photo
+    taken = DateProperty(datetime(2020, 1, 2, 3, 4, 5), DateType.TAKEN)
+    cache.put_many([(path, st, taken)])
+
+    assert cache.get_many([(path, st)]) == [taken]
+
+
+def test_no_exif_is_remembered(cache, photo):
+    path, st = photo
+    cache.put_many([(path, st, DateProperty(None, DateType.NO_DATA))])
+
+    assert cache.get_many([(path, st)]) == [
+        DateProperty(None, DateType.NO_DATA)
+    ]
+
+
+def test_changed_file_is_a_miss(cache, photo):
+    path, st = photo
+    taken = DateProperty(datetime(2020, 1, 2, 3, 4, 5), DateType.TAKEN)
+    cache.put_many([(path, st, taken)])
+
+    with open(path, "ab") as f:
+        f.write(b"\x00")
+    assert cache.get_many([(path, os.stat(path))]) == [None]
+
+
+def test_garbage_row_is_a_miss(cache, photo, tmp_path):
+    path, st = photo
+    with sqlite3.connect(tmp_path / "exif_cache.sqlite") as conn:
+        conn.execute(
+            "INSERT INTO exif VALUES (?, ?, ?, ?)",
+            (os.path.abspath(path), st.st_mtime_ns, st.st_size, "garbage"),
+        )
+
+    assert cache.get_many([(path, st)]) == [None]
@@ -0,0 +1,332 @@
+import io
+import os
+import struct
+from datetime import datetime
+
+import pytest
+from PIL import Image
+
+from photo_rename.filing import (
+    DateType,
+    _fast_jpeg_datetimes,
+    _get_dateproperty_from_exif,
+    _parse_exif_datetime,
+    get_exif_dateproperty,
+    get_unique_path,
+    get_unique_path_fast,
+    list_dir_names,
+    path_key,
+    resolve_best_datetime,
+    stat_files,
+)
+
+TAG_DATETIME = 306
+TAG_EXIF_IFD = 34665
+TAG_DATETIME_ORIGINAL = 36867
+BLANK_DATE = "    :  :     :  :  "
+
+
+def make_tiff(
+    endian: str = "<",
+    date_time: str | None = None,
+    date_time_original: str | None = None,
+) -> bytes:
+    """Build a TIFF block with DateTime in IFD0 and DateTimeOriginal in Exif"""
+    ifd0_entries = 1 + (date_time is not None)
+    ifd0_size = 2 + 12 * ifd0_entries + 4
+    exif_offset = 8 + ifd0_size
+    exif_entries = int(date_time_original is not None)
+    data_offset = exif_offset + 2 + 12 * exif_entries + 4
+
+    data = b""
+
+    def ascii_entry(tag: int, value: str) -> bytes:
+        nonlocal data
+        raw = value.encode("ascii") + b"\x00"
+        entry = struct.pack(
+            endian + "HHII", tag, 2, len(raw), data_offset + len(data)
+        )
+        data += raw
+        return entry
+
+    ifd0 = struct.pack(endian + "H", ifd0_entries)
+    if date_time is not None:
+        ifd0 += ascii_entry(TAG_DATETIME, date_time)
+    ifd0 += struct.pack(endian + "HHII", TAG_EXIF_IFD, 4, 1, exif_offset)
+    ifd0 += b"\x00\x00\x00\x00"
+
+    exif = struct.pack(endian + "H", exif_entries)
+    if date_time_original is not None:
+        exif += ascii_entry(TAG_DATETIME_ORIGINAL, date_time_original)
+    exif += b"\x00\x00\x00\x00"
+
+    order = b"II" if endian == "<" else b"MM"
+    header = order + struct.pack(endian + "HI", 42, 8)
+    return header + ifd0 + exif + data
+
+
+def segment(marker: int, payload: bytes) -> bytes:
+    return struct.pack(">BBH", 0xFF, marker, len(payload) + 2) + payload
+
+
+def make_jpeg_header(*segments: bytes) -> bytes:
+    """SOI, the given segments and a start-of-scan marker"""
+    return b"\xff\xd8" + b"".join(segments) + b"\xff\xda\x00\x08"
+
+
+def make_real_jpeg(tiff: bytes) -> bytes:
+    """A decodable JPEG whose APP0 is followed by a junk byte
+
+    The junk makes the fast APP1 reader give up, while Pillow skips it.
+    """
+    buf = io.BytesIO()
+    Image.new("RGB", (8, 8)).save(buf, "JPEG", exif=b"Exif\x00\x00" + tiff)
+    data = buf.getvalue()
+    assert data[2:4] == b"\xff\xe0"
+    (app0_length,) = struct.unpack(">H", data[4:6])
+    cut = 4 + app0_length
+    return data[:cut] + b"\x00" + data[cut:]
+
+
+def read_fast(data: bytes) -> list[str]:
+    return _fast_jpeg_datetimes(io.BytesIO(data))
+
+
+@pytest.mark.parametrize("endian", ["<", ">"])
+def test_fast_reader_handles_both_byte_orders(endian):
+    tiff = make_tiff(endian, "2020:01:02 03:04:05", "2021:02:03 04:05:06")
+    data = make_jpeg_header(segment(0xE1, b"Exif\x00\x00" + tiff))
+
+    assert read_fast(data) == ["2021:02:03 04:05:06", "2020:01:02 03:04:05"]
+
+
+def test_fast_reader_skips_xmp_app1_before_exif():
+    xmp = segment(0xE1, b"http://ns.adobe.com/xap/1.0/\x00<x:xmpmeta/>")
+    exif = segment(
+        0xE1, b"Exif\x00\x00" + make_tiff(date_time="2020:01:02 03:04:05")
+    )
+    data = make_jpeg_header(xmp, exif)
+
+    assert read_fast(data) == ["2020:01:02 03:04:05"]
+
+
+def test_fast_reader_returns_nothing_without_app1():
+    data = make_jpeg_header(segment(0xE0, b"JFIF\x00\x01\x01\x00"))
+
+    assert read_fast(data) == []
+
+
+def test_fast_reader_rejects_bad_ifd_offset():
+    tiff = bytearray(make_tiff(date_time="2020:01:02 03:04:05"))
+    tiff[4:8] = struct.pack("<I", 0xFFFF)
+    data = make_jpeg_header(segment(0xE1, b"Exif\x00\x00" + bytes(tiff)))
+
+    with pytest.raises(struct.error):
+        read_fast(data)
+
+
+def test_fast_reader_rejects_truncated_segment():
+    data = make_jpeg_header(segment(0xE1, b"Exif\x00\x00"))[:-4]
+
+    with pytest.raises((struct.error, ValueError)):
+        read_fast(data)
+
+
+def test_unreadable_app1_falls_back_to_pil(tmp_path):
+    path = tmp_path / "junk.jpg"
+    tiff = make_tiff(date_time_original="2021:02:03 04:05:06")
+    path.write_bytes(make_real_jpeg(tiff))
+
+    with path.open("rb") as fp:
+        fp.seek(2)
+        with pytest.raises(ValueError):
+            _fast_jpeg_datetimes(fp)
+
+    dproperty = _get_dateproperty_from_exif(str(path))
+    assert dproperty.dtype == DateType.TAKEN
+    assert dproperty.dt == datetime(2021, 2, 3, 4, 5, 6)
+
+
+def test_blank_datetime_original_uses_datetime_in_fast_path(tmp_path):
+    path = tmp_path / "blank.jpg"
+    tiff = make_tiff(
+        date_time="2020:01:02 03:04:05", date_time_original=BLANK_DATE
+    )
+    path.write_bytes(
+        make_jpeg_header(segment(0xE1, b"Exif\x00\x00" + tiff))
+    )
+
+    dproperty = _get_dateproperty_from_exif(str(path))
+    assert dproperty.dtype == DateType.TAKEN
+    assert dproperty.dt == datetime(2020, 1, 2, 3, 4, 5)
+
+
+def test_blank_datetime_original_uses_datetime_in_pil_path(tmp_path):
+    path = tmp_path / "blank.jpg"
+    tiff = make_tiff(
+        date_time="2020:01:02 03:04:05", date_time_original=BLANK_DATE
+    )
+    path.write_bytes(make_real_jpeg(tiff))
+
+    dproperty = _get_dateproperty_from_exif(str(path))
+    assert dproperty.dtype == DateType.TAKEN
+    assert dproperty.dt == datetime(2020, 1, 2, 3, 4, 5)
+
+
+def test_unreadable_file_raises_instead_of_no_data(tmp_path):
+    # Opening a directory fails like a locked or offline file would
+    st = os.stat(tmp_path)
+
+    with pytest.raises(OSError):
+        get_exif_dateproperty(str(tmp_path), st)
+
+    dproperty = resolve_best_datetime(str(tmp_path), st)
+    assert dproperty.dtype in (DateType.CREATED, DateType.MODIFIED)
+
+
+def test_names_differing_only_by_case_collide(tmp_path):
+    taken = {path_key(f"{tmp_path.as_posix()}/D.JPG")}
+    candidate = f"{tmp_path.as_posix()}/D.jpg"
+
+    assert get_unique_path(candidate, taken) == (
+        f"{tmp_path.as_posix()}/D (1).jpg"
+    )
+    assert get_unique_path_fast(candidate, set(), taken) == (
+        f"{tmp_path.as_posix()}/D (1).jpg"
+    )
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        "2020:01:02 03:04:05",
+        "2020-01-02 03:04:05",
+        "2020-01-02T03:04:05",
+        "2020:01:02 03:04:05\x00",
+    ],
+)
+def test_parse_exif_datetime_accepts_complete_values(value):
+    assert _parse_exif_datetime(value) == datetime(2020, 1, 2, 3, 4, 5)
+
+
+@pytest.mark.parametrize(
+    "value", ["2020:01:02", "2020:01:02 03", "20200102", BLANK_DATE]
+)
+def test_parse_exif_datetime_rejects_partial_values(value):
+    with pytest.raises(ValueError):
+        _parse_exif_datetime(value)
+
+
+def test_truncated_datetime_original_uses_datetime(tmp_path):
+    path = tmp_path / "truncated.jpg"
+    tiff = make_tiff(
+        date_time="2020:01:02 03:04:05", date_time_original="2021:02:03"
+    )
+    path.write_bytes(
+        make_jpeg_header(segment(0xE1, b"Exif\x00\x00" + tiff))
+    )
+
+    dproperty = _get_dateproperty_from_exif(str(path))
+    assert dproperty.dt == datetime(2020, 1, 2, 3, 4, 5)
+
+
+def test_unique_path_skips_name_taken_on_disk(tmp_path):
+    (tmp_path / "D.jpg").touch()
+    candidate = f"{tmp_path.as_posix()}/D.jpg"
+    expected = f"{tmp_path.as_posix()}/D (1).jpg"
+
+    assert get_unique_path(candidate, set()) == expected
+    existing = list_dir_names(str(tmp_path))
+    assert get_unique_path_fast(candidate, existing, set()) == expected
+
+
+def test_unique_path_skips_name_taken_by_earlier_row(tmp_path):
+    candidate = f"{tmp_path.as_posix()}/D.jpg"
+    taken = {path_key(candidate)}
+    expected = f"{tmp_path.as_posix()}/D (1).jpg"
+
+    assert get_unique_path(candidate, taken) == expected
+    assert get_unique_path_fast(candidate, set(), taken) == expected
+
+
+def test_unique_path_sees_file_created_after_listing(tmp_path):
+    existing = list_dir_names(str(tmp_path))
+    (tmp_path / "D.jpg").touch()
+    candidate = f"{tmp_path.as_posix()}/D.jpg"
+
+    assert get_unique_path_fast(candidate, existing, set()) == (
+        f"{tmp_path.as_posix()}/D (1).jpg"
+    )
+    assert os.path.normcase("D.jpg") in existing
+
+
+def test_unique_path_counts_past_taken_suffixes(tmp_path):
+    (tmp_path / "D.jpg").touch()
+    (tmp_path / "D (1).jpg").touch()
+    candidate = f"{tmp_path.as_posix()}/D.jpg"
+    taken = {path_key(f"{tmp_path.as_posix()}/D (2).jpg")}
+    expected = f"{tmp_path.as_posix()}/D (3).jpg"
+
+    assert get_unique_path(candidate, taken) == expected
+    existing = list_dir_names(str(tmp_path))
+    assert get_unique_path_fast(candidate, existing, taken) == expected
+
+
+def test_stat_files_stats_single_file_without_scandir(tmp_path, monkeypatch):
+    path = tmp_path / "a.jpg"
+    path.write_bytes(b"abc")
+
+    def no_scandir(dir_name):
+        raise AssertionError("a lone file should not list its folder")
+
+    monkeypatch.setattr(os, "scandir", no_scandir)
+    [(found, st)] = stat_files([str(path)])
+
+    assert found == str(path)
+    assert st.st_size == 3
+
+
+def test_stat_files_rejects_directories_and_missing_paths(tmp_path):
+    (tmp_path / "a.jpg").touch()
+    (tmp_path / "folder.jpg").mkdir()
+    paths = [
+        str(tmp_path / "a.jpg"),
+        str(tmp_path / "folder.jpg"),
+        str(tmp_path / "missing.jpg"),
+    ]
+
+    assert [p for p, _ in stat_files(paths)] == [str(tmp_path / "a.jpg")]
+    # The same checks on the single-path fallback
+    assert stat_files([str(tmp_path / "folder.jpg")]) == []
+    assert stat_files([str(tmp_path / "missing.jpg")]) == []
+
+
+def test_stat_files_falls_back_for_unreadable_folder(tmp_path, monkeypatch):
+    (tmp_path / "a.jpg").touch()
+    (tmp_path / "b.jpg").touch()
+    real_scandir = os.scandir
+
+    def locked_scandir(dir_name):
+        if dir_name == str(tmp_path):
+            raise PermissionError(dir_name)
+        return real_scandir(dir_name)
+
+    monkeypatch.setattr(os, "scandir", locked_scandir)
+    paths = [str(tmp_path / "a.jpg"), str(tmp_path / "b.jpg")]
+
+    assert [p for p, _ in stat_files(paths)] == paths
+
+
+def test_stat_files_keeps_input_order_across_folders(tmp_path):
+    for folder in ("x", "y"):
+        (tmp_path / folder).mkdir()
+        for name in ("1.jpg", "2.jpg"):
+            (tmp_path / folder / name).touch()
+    paths = [
+        str(tmp_path / "y" / "2.jpg"),
+        str(tmp_path / "x" / "1.jpg"),
+        str(tmp_path / "y" / "1.jpg"),
+        str(tmp_path / "x" / "2.jpg"),
+    ]
+
+    assert [p for p, _ in stat_files(paths)] == paths